@@ -1,9 +1,11 @@
 import discord
 from redbot.core import commands
 from PIL import Image, ImageDraw, ImageFont
+import functools
 import io
 import os
-from typing import Tuple, List
+import threading
+from typing import Tuple, List, Optional
 
 
 class AvgFamil(commands.Cog):
@@ -17,6 +19,7 @@ class AvgFamil(commands.Cog):
 
         # Fixed font size
         self.font_size = 17
+        self.line_spacing = 5  # Vertical gap between wrapped lines
 
         # Text positioning based on user specifications
         self.text2_bottom_left = (88, 163)  # Bottom-left anchor for text2
@@ -29,23 +32,73 @@ class AvgFamil(commands.Cog):
         self.line_start = (60, 171)
         self.line_end = (58, 139)
 
+        # Lazily loaded and reused across invocations
+        self._font = None
+        self._base = None
+        self._line_heights = {}  # Rendered line -> pixel height
+        # FreeType faces are not thread-safe, so executor renders take turns
+        self._render_lock = threading.Lock()
+        # Finished PNGs keyed by the normalized (text1, text2) pair
+        self._render_png = functools.lru_cache(maxsize=128)(self._render_png_uncached)
+        # Rasterized text blocks keyed by their wrapped lines, reused when only
+        # one of the two texts changes
+        self._text_mask = functools.lru_cache(maxsize=256)(self._text_mask_uncached)
+
+    async def cog_load(self):
+        """Called when the cog is loaded - warm the asset caches off the event loop"""
+        await self.bot.loop.run_in_executor(None, self._load_assets)
+
+    def _load_assets(self):
+        """Decode the base image and font so the first command skips cold-start I/O."""
+        with self._render_lock:
+            self._get_base()
+            self._get_font()
+
+    def _get_font(self) -> ImageFont.FreeTypeFont:
+        """Return the shared font instance, loading it on first use."""
+        if self._font is None:
+            self._font = ImageFont.truetype(self.font_path, self.font_size)
+        return self._font
+
+    def _get_base(self) -> Image.Image:
+        """Return the decoded base image, loading it on first use.
+
+        Callers must copy the returned image before drawing on it.
+        """
+        if self._base is None:
+            base = Image.open(self.base_image_path)
+            base.load()  # Decodes the pixels and releases the file handle
+            # The shipped asset is already RGB, so avoid a redundant conversion copy
+            self._base = base if base.mode == 'RGB' else base.convert('RGB')
+        return self._base
+
     def wrap_text(self, text: str, font: ImageFont.FreeTypeFont, max_width: int) -> List[str]:
         """Wrap text to fit within max_width."""
         words = text.split()
         lines = []
         current_line = []
+        current_width = 0
+
+        # Measure each distinct word once and build line widths from the parts
+        getlength = font.getlength
+        space_width = getlength(' ')
+        word_widths = {word: getlength(word) for word in set(words)}
 
         for word in words:
-            test_line = ' '.join(current_line + [word])
-            bbox = font.getbbox(test_line)
-            width = bbox[2] - bbox[0]
+            word_width = word_widths[word]
+            if current_line:
+                width = current_width + space_width + word_width
+            else:
+                width = word_width
 
             if width <= max_width:
                 current_line.append(word)
+                current_width = width
             else:
                 if current_line:
                     lines.append(' '.join(current_line))
                     current_line = [word]
+                    current_width = word_width
                 else:
                     # Single word is too long, add it anyway
                     lines.append(word)
@@ -55,19 +108,65 @@ class AvgFamil(commands.Cog):
 
         return lines
 
-    def get_text_height(self, lines: List[str], font: ImageFont.FreeTypeFont, line_spacing: int = 5) -> int:
+    def get_line_height(self, line: str, font: ImageFont.FreeTypeFont) -> int:
+        """Return the rendered height of a single line, measuring it only once."""
+        height = self._line_heights.get(line)
+        if height is None:
+            bbox = font.getbbox(line)
+            height = bbox[3] - bbox[1]
+            if len(self._line_heights) >= 1024:
+                self._line_heights.clear()
+            self._line_heights[line] = height
+        return height
+
+    def get_text_height(self, lines: List[str], font: ImageFont.FreeTypeFont) -> int:
         """Calculate total height needed for wrapped text."""
         if not lines:
             return 0
 
+        line_spacing = self.line_spacing
+        get_line_height = self.get_line_height
         total_height = 0
         for line in lines:
-            bbox = font.getbbox(line)
-            height = bbox[3] - bbox[1]
-            total_height += height + line_spacing
+            total_height += get_line_height(line, font) + line_spacing
 
         return total_height - line_spacing  # Remove last spacing
 
+    def _text_mask_uncached(self, lines: Tuple[str, ...]) -> Optional[Tuple[Image.Image, Tuple[int, int]]]:
+        """Rasterize wrapped lines into an 'L' mask cropped to the inked area.
+
+        Returns the mask and its offset from the block's top-left corner, or
+        None if nothing is drawn. Callers must hold the render lock.
+        """
+        font = self._get_font()
+        ascent, descent = font.getmetrics()
+        # Pad every side so glyphs overhanging their advance are not clipped
+        pad = self.font_size
+        width = int(max(font.getlength(line) for line in lines)) + 2 * pad
+        height = self.get_text_height(list(lines), font) + ascent + descent + 2 * pad
+
+        mask = Image.new('L', (width, height), 0)
+        draw = ImageDraw.Draw(mask)
+        y = pad
+        for line in lines:
+            draw.text((pad, y), line, fill=255, font=font)
+            y += self.get_line_height(line, font) + self.line_spacing
+
+        bbox = mask.getbbox()
+        if bbox is None:
+            return None
+        return mask.crop(bbox), (bbox[0] - pad, bbox[1] - pad)
+
+    def paste_text_lines(self, img: Image.Image, lines: List[str], pos: Tuple[int, int]):
+        """Draw wrapped lines top-down in black using the cached text mask."""
+        if not lines:
+            return
+        cached = self._text_mask(tuple(lines))
+        if cached is None:
+            return
+        mask, (dx, dy) = cached
+        img.paste((0, 0, 0), (pos[0] + dx, pos[1] + dy), mask)
+
     def normalize_quotes(self, text: str) -> str:
         """Normalize quotation mark characters to ASCII equivalents."""
         # Replace curly/smart double quotes with straight quotes
@@ -93,21 +192,30 @@ class AvgFamil(commands.Cog):
         draw.line([start, end], fill='black', width=1)
 
     def generate_image(self, text1: str, text2: str) -> io.BytesIO:
-        """Generate the custom XKCD image."""
-        # Load base image
-        img = Image.open(self.base_image_path).convert('RGB')
-        original_height = img.height
-
-        # Create font at fixed size
-        font = ImageFont.truetype(self.font_path, self.font_size)
+        """Generate the custom XKCD image.
 
+        Designed to be run in an executor to avoid blocking the event loop.
+        """
         # Normalize quotes and apostrophes
         text1 = self.normalize_quotes(text1)
         text2 = self.normalize_quotes(text2)
 
-        # Convert text to uppercase (XKCD style)
-        text1 = text1.upper()
-        text2 = text2.upper()
+        # Convert text to uppercase (XKCD style), skipping text that already is
+        if not text1.isupper():
+            text1 = text1.upper()
+        if not text2.isupper():
+            text2 = text2.upper()
+
+        # Repeated requests are served from the PNG cache
+        with self._render_lock:
+            data = self._render_png(text1, text2)
+
+        return io.BytesIO(data)
+
+    def _render_png_uncached(self, text1: str, text2: str) -> bytes:
+        """Render normalized text to PNG bytes. Callers must hold the render lock."""
+        # Lay out the text before touching any image data
+        font = self._get_font()
 
         # Wrap both texts
         lines2 = self.wrap_text(text2, font, self.text2_max_width)
@@ -117,72 +225,68 @@ class AvgFamil(commands.Cog):
         height2 = self.get_text_height(lines2, font)
         height1 = self.get_text_height(lines1, font)
 
+        # Shared base image; never drawn on directly
+        base = self._get_base()
+        original_height = base.height
+
+        # Bind layout constants once
+        text1_x = self.text1_x
+        text2_x, text2_bottom_y = self.text2_bottom_left
+        text_gap = self.text_gap
+        line_start = self.line_start
+
         # Calculate positions
         # text2: bottom-left is at (88, 163), so top-left is at (88, 163 - height2)
-        text2_top_y = self.text2_bottom_left[1] - height2
-        text2_pos = (self.text2_bottom_left[0], text2_top_y)
-
+        text2_top_y = text2_bottom_y - height2
         # text1: positioned 20px above text2's top
-        text1_pos = (self.text1_x, text2_top_y - self.text_gap - height1)
-
-        # Check if we need to expand the image vertically
-        # We need space from text1's top down to the original bottom
-        min_required_height = text1_pos[1] + height1 + self.text_gap + height2 + (original_height - self.text2_bottom_left[1])
-
-        if min_required_height > original_height or text1_pos[1] < 0:
+        text1_top_y = text2_top_y - text_gap - height1
+
+        # The block is bottom-anchored, so it fits unless text1 runs off the top
+        if text1_top_y >= 0:
+            # Fast path: draw on a plain copy of the base
+            img = base.copy()
+            text1_pos = (text1_x, text1_top_y)
+            text2_pos = (text2_x, text2_top_y)
+            line_start_adjusted = line_start
+        else:
             # Calculate new height needed
             # We want text1 to start at y=10 (small margin from top)
             top_margin = 10
-            new_height = top_margin + height1 + self.text_gap + height2 + (original_height - self.text2_bottom_left[1])
+            new_height = top_margin + height1 + text_gap + height2 + (original_height - text2_bottom_y)
 
-            # Create new image with extended height
-            new_img = Image.new('RGB', (img.width, new_height), 'white')
+            # Create the extended canvas directly from the cached base
+            img = Image.new('RGB', (base.width, new_height), 'white')
             # Paste original image at bottom, preserving bottom alignment
             paste_y = new_height - original_height
-            new_img.paste(img, (0, paste_y))
-            img = new_img
+            img.paste(base, (0, paste_y))
 
             # Recalculate positions
-            text1_pos = (self.text1_x, top_margin)
-            text2_pos = (self.text2_bottom_left[0], top_margin + height1 + self.text_gap)
+            text1_pos = (text1_x, top_margin)
+            text2_pos = (text2_x, top_margin + height1 + text_gap)
 
             # Adjust line start position (anchored to bottom of original image)
-            line_start_adjusted = (self.line_start[0], self.line_start[1] + paste_y)
-        else:
-            line_start_adjusted = self.line_start
+            line_start_adjusted = (line_start[0], line_start[1] + paste_y)
 
         # Calculate line end position: halfway between text1 bottom and text2 top
         text1_bottom_y = text1_pos[1] + height1
-        text2_top_y = text2_pos[1]
-        line_end_y = text1_bottom_y + (self.text_gap / 2)
+        line_end_y = text1_bottom_y + (text_gap / 2)
         line_end_adjusted = (self.line_end[0], int(line_end_y))
 
+        # Draw both text blocks
+        self.paste_text_lines(img, lines1, text1_pos)
+        self.paste_text_lines(img, lines2, text2_pos)
+
         # Create drawing context
         draw = ImageDraw.Draw(img)
 
-        # Draw text1
-        y_offset = text1_pos[1]
-        for line in lines1:
-            draw.text((text1_pos[0], y_offset), line, fill='black', font=font)
-            bbox = font.getbbox(line)
-            y_offset += (bbox[3] - bbox[1]) + 5
-
-        # Draw text2
-        y_offset = text2_pos[1]
-        for line in lines2:
-            draw.text((text2_pos[0], y_offset), line, fill='black', font=font)
-            bbox = font.getbbox(line)
-            y_offset += (bbox[3] - bbox[1]) + 5
-
         # Draw the speech line (3px thick: grey-black-grey)
         self.draw_speech_line(draw, line_start_adjusted, line_end_adjusted)
 
-        # Convert to bytes for Discord
+        # Convert to bytes for Discord (fast DEFLATE; the panel is small either way)
         output = io.BytesIO()
-        img.save(output, format='PNG')
-        output.seek(0)
+        img.save(output, format='PNG', compress_level=1)
 
-        return output
+        return output.getvalue()
 
     @commands.command(name="avgfamil", aliases=["xkcd2501"])
     async def avgfamil_command(self, ctx, text1: str, text2: str):
@@ -195,8 +299,10 @@ class AvgFamil(commands.Cog):
         the "of course" portion of the original comic.
         """
         try:
-            # Generate the image
-            image_bytes = self.generate_image(text1, text2)
+            # Generate the image off the event loop
+            image_bytes = await self.bot.loop.run_in_executor(
+                None, self.generate_image, text1, text2
+            )
 
             # Send as Discord file
             file = discord.File(image_bytes, filename="avgfamil.png")
@@ -1,9 +1,13 @@
+import asyncio
 import discord
+import functools
 import re
 import random
+import tempfile
 import d20
-import statistics
 import logging
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from redbot.core import commands, Config
 from typing import List, Dict, Tuple, Optional
@@ -15,8 +19,13 @@ from .chimeradice_core import (
     DEFAULT_GUILD,
     DEFAULT_CHANNEL,
     FALLOUT_FACES,
+    FALLOUT_FACE_VALUES,
     FUDGE_FACES,
     FUDGE_PROBABILITIES,
+    SIMPLE_DICE_RE,
+    ADVANCED_OPS_RE,
+    FUDGE_DICE_RE,
+    FALLOUT_DICE_RE,
     # Result classes
     DiceRollResult,
     SimpleRollResult,
@@ -31,11 +40,13 @@ from .chimeradice_core import (
     validate_dice_expression,
     normalize_dice_key,
     parse_roll_and_label,
+    parse_roll_timestamp,
     translate_dice_syntax,
     extract_base_dice,
     # Weighted rolling functions
-    roll_weighted_standard_die,
+    roll_weighted_standard_dice,
     roll_weighted_fudge_dice,
+    roll_simple_dice,
     generate_fudge_dice_for_sum,
     generate_realistic_fudge_faces,
     # CPR mode functions
@@ -48,6 +59,62 @@ from .chimeradice_core import (
 
 log = logging.getLogger("red.chimeradice")
 
+# Replies for the decoy "cheat" commands
+FAKE_COMMAND_RESPONSES = (
+    "You really thought?",
+    "Not an option.",
+    "Nope.",
+    "Access denied. 🚫",
+    "Did you mean to roll dice? Try `>roll`",
+    "That's not how this works.",
+    "Bold of you to assume.",
+    "No cheating! 🎲",
+    "The dice gods frown upon this.",
+    "Try harder. Or don't.",
+    "Dad says no.",
+    "I'm telling dad!",
+    "Nada.",
+    "Take -2 to your next roll.",
+)
+
+# Precompiled dice patterns (case-insensitive, so callers needn't lowercase)
+QUEUED_FUDGE_RE = re.compile(r'(\d+)df', re.IGNORECASE)
+QUEUED_FALLOUT_RE = re.compile(r'(\d+)dd', re.IGNORECASE)
+STANDARD_DICE_RE = re.compile(r'(\d+)d(\d+)', re.IGNORECASE)
+BIASED_DICE_RE = re.compile(r'^(\d+)d(\d+)(?:([+-])(\d+))?$', re.IGNORECASE)
+# CPR mode rolls (matched against the lowercased, space-free expression)
+CPR_D10_RE = re.compile(r'^1?d10([+-]\d+)*$')
+CPR_D6_POOL_RE = re.compile(r'^(\d+)d6([+-]\d+)*$')
+# Initiative modifiers: integers joined by + and -
+INIT_MODIFIER_RE = re.compile(r'^[+-]?\d+([+-]\d+)*$')
+
+# Emoji shown in front of each roll type's output
+ROLL_EMOJIS = {
+    "standard": "🎲",
+    "luck": "🍀",
+    "karma": "⚖️",
+}
+
+# Display symbol for each fudge face
+FUDGE_SYMBOLS = {1: '**+**', 0: '☐', -1: '**-**'}
+
+# Server-wide stats list each roll type is recorded under
+ROLL_TYPE_KEYS = {
+    "standard": "standard_rolls",
+    "luck": "luck_rolls",
+    "karma": "karma_rolls",
+}
+
+# Recent percentiles kept per user; natural luck is a running mean over all of them
+PERCENTILE_HISTORY_LIMIT = 500
+
+# Queued test rolls expire after this long; the sweep runs on a timer
+TEST_QUEUE_EXPIRY = timedelta(hours=12)
+TEST_QUEUE_CLEANUP_INTERVAL = 30 * 60  # seconds
+
+# History exports stay in memory up to this size, then spill to a temp file
+EXPORT_SPOOL_MAX_SIZE = 1 << 20  # bytes
+
 
 class CriticalInjuryView(discord.ui.View):
     """Discord buttons for rolling on CPR critical injury tables."""
@@ -114,6 +181,23 @@ class ChimeraDice(commands.Cog):
         # Test queue for validating luck/karma probability systems.
         # Used by test utilities to run deterministic sequences for system validation.
         self.test_queue = {}
+        self.test_queue_cleanup_task = self.bot.loop.create_task(self.run_test_queue_cleanup_loop())
+
+        # Per-user roll bookkeeping: rolls by the same user run one at a time,
+        # and the user's config data is loaded once and shared for the whole roll
+        self._user_locks: Dict[int, asyncio.Lock] = {}
+        self._user_cache: Dict[int, dict] = {}
+
+        # Validation results keyed by dice expression; the same few are rolled constantly
+        self._validate_dice_expression_with_d20 = functools.lru_cache(maxsize=1024)(
+            self._validate_dice_expression_with_d20_uncached
+        )
+
+        # Standard-dice rollers for roll types that bias the dice
+        self._biased_rollers = {
+            "karma": self._roll_standard_dice_with_karma,
+            "luck": self._roll_standard_dice_with_luck,
+        }
 
         # Local test handler - will be set by test utilities if available
         self._test_handler = None
@@ -125,17 +209,21 @@ class ChimeraDice(commands.Cog):
         except ImportError:
             pass  # Test utilities not installed, skip silently
 
+    def cog_unload(self):
+        self.test_queue_cleanup_task.cancel()
+
     # --- CORE COMMANDS ---
 
     @commands.command(name="roll", aliases=["r"])
     async def roll(self, ctx: commands.Context, *, roll_string: str):
         """Standard dice rolling with d20 library support."""
         # Check if user has luck or karma mode enabled - if so, use that mode
-        user_data = await self.config.user(ctx.author).all()
+        # Only the toggles are needed here; the roll itself loads the full user data
+        toggles = await self.config.user(ctx.author).toggles()
         
-        if user_data["toggles"]["luckmode_on"]:
+        if toggles["luckmode_on"]:
             await self._execute_roll(ctx, roll_string, "luck")
-        elif user_data["toggles"]["karmamode_on"]:
+        elif toggles["karmamode_on"]:
             await self._execute_roll(ctx, roll_string, "karma")
         else:
             await self._execute_roll(ctx, roll_string, "standard")
@@ -152,124 +240,165 @@ class ChimeraDice(commands.Cog):
 
     async def _execute_roll(self, ctx: commands.Context, roll_string: str, roll_type: str):
         """Execute a roll with the specified type (standard, luck, karma)."""
-        try:
-            # Parse dice expression and optional label
-            dice_expr, label = parse_roll_and_label(roll_string)
-
-            # Validate dice expression first (only the dice part, not the label)
-            is_valid, error_msg = self._validate_dice_expression_with_d20(dice_expr)
-            if not is_valid:
-                await ctx.send(f"Invalid dice expression: {error_msg}")
-                return
+        async with self._user_roll_scope(ctx.author):
+            try:
+                # Parse dice expression and optional label
+                dice_expr, label = parse_roll_and_label(roll_string)
 
-            user_id = ctx.author.id
-            queued_result = None
+                # Validate dice expression first (only the dice part, not the label)
+                is_valid, error_msg = self._validate_dice_expression_with_d20(dice_expr)
+                if not is_valid:
+                    await ctx.send(f"Invalid dice expression: {error_msg}")
+                    return
 
-            if user_id in self.test_queue:
-                # Clean up expired rolls first
-                self._cleanup_expired_test_queue()
+                user_id = ctx.author.id
+                queued_result = None
 
-                # Normalize the dice expression for consistent lookup
-                normalized_key = normalize_dice_key(dice_expr)
+                if user_id in self.test_queue:
+                    # Normalize the dice expression for consistent lookup
+                    normalized_key = normalize_dice_key(dice_expr)
 
-                if normalized_key in self.test_queue[user_id]:
-                    data = self.test_queue[user_id][normalized_key]
-                    # Handle both new format (dict) and legacy format (list)
-                    if isinstance(data, dict) and "values" in data and data["values"]:
-                        queued_result = data["values"].pop(0)
-                        # Remove entry if no more values
-                        if not data["values"]:
-                            del self.test_queue[user_id][normalized_key]
-                            # Clean up empty user dict
-                            if not self.test_queue[user_id]:
-                                del self.test_queue[user_id]
-                    elif isinstance(data, list) and data:
-                        # Legacy format support
-                        queued_result = data.pop(0)
-                        if not data:
+                    if normalized_key in self.test_queue[user_id]:
+                        data = self.test_queue[user_id][normalized_key]
+                        # Expired entries (including legacy list entries) are swept
+                        # periodically; never consume one in between
+                        if self._is_test_queue_entry_expired(data, datetime.now()):
                             del self.test_queue[user_id][normalized_key]
-                            # Clean up empty user dict
                             if not self.test_queue[user_id]:
                                 del self.test_queue[user_id]
-
-            # Handle special dice types first
-            if 'df' in dice_expr.lower() or 'f' in dice_expr.lower():
-                await self._handle_fudge_dice(ctx, dice_expr, roll_type, queued_result, label)
-                return
-            elif 'dd' in dice_expr.lower():
-                await self._handle_fallout_dice(ctx, dice_expr, roll_type, queued_result, label)
-                return
-
-            # Check for CPR mode
-            cpr_enabled = await self.config.channel(ctx.channel).cpr_mode()
-            if cpr_enabled:
-                # Check if this is a simple d10 roll
-                if self._is_simple_d10_roll(dice_expr):
-                    await self._handle_cpr_d10_roll(ctx, dice_expr, label)
+                        elif isinstance(data, dict) and "values" in data and data["values"]:
+                            queued_result = data["values"].pop(0)
+                            # Remove entry if no more values
+                            if not data["values"]:
+                                del self.test_queue[user_id][normalized_key]
+                                # Clean up empty user dict
+                                if not self.test_queue[user_id]:
+                                    del self.test_queue[user_id]
+
+                # Handle special dice types first
+                dice_kind = self._dice_kind(dice_expr)
+                if dice_kind == "fudge":
+                    await self._handle_fudge_dice(ctx, dice_expr, roll_type, queued_result, label)
                     return
-
-                # Check if this is a d6 pool roll
-                is_d6_pool, num_dice = self._is_simple_d6_pool(dice_expr)
-                if is_d6_pool:
-                    await self._handle_cpr_d6_roll(ctx, dice_expr, num_dice, label)
+                elif dice_kind == "fallout":
+                    await self._handle_fallout_dice(ctx, dice_expr, roll_type, queued_result, label)
                     return
 
-            # Use d20 library for standard dice with full support for advanced operations
-            if queued_result is not None:
-                # For queued results with advanced operations, we need special handling
-                result = await self._handle_test_queue_standard_dice(ctx, dice_expr, queued_result, roll_type)
-            else:
-                # Apply bias for karma/luck rolls, otherwise roll normally
-                if roll_type == "karma":
-                    result = await self._roll_standard_dice_with_karma(ctx, dice_expr)
-                elif roll_type == "luck":
-                    result = await self._roll_standard_dice_with_luck(ctx, dice_expr)
-                else:
-                    # Translate user-friendly syntax to d20 library syntax
-                    translated_expression = translate_dice_syntax(dice_expr)
-                    result = d20.roll(translated_expression)
+                # Check for CPR mode
+                cpr_enabled = await self.config.channel(ctx.channel).cpr_mode()
+                if cpr_enabled:
+                    # Check if this is a simple d10 roll
+                    if self._is_simple_d10_roll(dice_expr):
+                        await self._handle_cpr_d10_roll(ctx, dice_expr, label)
+                        return
+
+                    # Check if this is a d6 pool roll
+                    is_d6_pool, num_dice = self._is_simple_d6_pool(dice_expr)
+                    if is_d6_pool:
+                        await self._handle_cpr_d6_roll(ctx, dice_expr, num_dice, label)
+                        return
+
+                # Use d20 library for standard dice with full support for advanced operations
+                # Validation only parsed the expression, so errors that surface while
+                # rolling (e.g. runaway explosions) are reported the same way here
+                try:
+                    if queued_result is not None:
+                        # For queued results with advanced operations, we need special handling
+                        result = await self._handle_test_queue_standard_dice(ctx, dice_expr, queued_result, roll_type)
+                    else:
+                        # Apply bias for karma/luck rolls, otherwise roll normally
+                        biased_roller = self._biased_rollers.get(roll_type)
+                        if biased_roller:
+                            result = await biased_roller(ctx, dice_expr)
+                        else:
+                            # Plain NdM(+/-K) rolls skip the d20 library entirely
+                            result = roll_simple_dice(dice_expr)
+                            if result is None:
+                                # Translate user-friendly syntax to d20 library syntax
+                                translated_expression = translate_dice_syntax(dice_expr)
+                                result = d20.roll(translated_expression)
+                except d20.RollError as e:
+                    await ctx.send(f"Invalid dice expression: Invalid d20 expression: {str(e)}")
+                    return
             
-            actual_total = result.total
-            display_result = result.result
+                actual_total = result.total
+                display_result = result.result
             
-            # Store original result before modifications (for natural luck tracking)
-            original_total = actual_total
+                # Store original result before modifications (for natural luck tracking)
+                original_total = actual_total
             
-            # Apply roll type modifications (but not if queued)
-            if queued_result is None:
-                if roll_type == "luck":
-                    # Luck bias was already applied during dice generation
-                    # No additional modification needed
-                    pass
-                elif roll_type == "karma":
-                    result, modified_total = await self._apply_karma_modification(ctx, result)
-                    actual_total = modified_total
-                    display_result = f"{result.result.split('=')[0].strip()} = {modified_total}"
+                # Apply roll type modifications (but not if queued)
+                if queued_result is None:
+                    if roll_type == "luck":
+                        # Luck bias was already applied during dice generation
+                        # No additional modification needed
+                        pass
+                    elif roll_type == "karma":
+                        result, modified_total = await self._apply_karma_modification(ctx, dice_expr, result)
+                        actual_total = modified_total
+                        # Swap the trailing "= total" for the modified total; only the last
+                        # '=' separates it, so split once from the right
+                        display_result = f"{result.result.rsplit('=', 1)[0].rstrip()} = {modified_total}"
             
-            # Record the roll (pass both modified and original results)
-            await self._record_roll(ctx, dice_expr, actual_total, roll_type, original_total)
+                # Format output with visual indicators
+                emoji = self._get_roll_emoji(roll_type)
+                # Include label in display if provided
+                roll_display = f"`{dice_expr}`" if label is None else f"`{dice_expr}` ({label})"
+                output = f"{emoji} **{ctx.author.display_name}** rolls {roll_display}...\n"
+                output += f"Result: {display_result} = **{actual_total}**"
 
-            # Format output with visual indicators
-            emoji = self._get_roll_emoji(roll_type)
-            # Include label in display if provided
-            roll_display = f"`{dice_expr}`" if label is None else f"`{dice_expr}` ({label})"
-            output = f"{emoji} **{ctx.author.display_name}** rolls {roll_display}...\n"
-            output += f"Result: {display_result} = **{actual_total}**"
+                if roll_type == "karma":
+                    debt = await self._get_user_karma(ctx.author, ctx.guild.id, ctx.channel.id)
+                    output += f" (Debt: {debt:+.1f})"
 
-            if roll_type == "karma":
-                debt = await self._get_user_karma(ctx.author, ctx.guild.id, ctx.channel.id)
-                output += f" (Debt: {debt:+.1f})"
+                await ctx.send(output)
 
-            await ctx.send(output)
+                # Record the roll (pass both modified and original results) once the
+                # user has their result, as the fudge and Fallout handlers do
+                await self._record_roll(ctx, dice_expr, actual_total, roll_type, original_total)
+
+            except Exception as e:
+                log.error(f"Roll execution failed for user {ctx.author} ({ctx.author.id}): roll_string='{roll_string}', roll_type='{roll_type}'", exc_info=True)
+                await ctx.send(f"Error: {str(e)}")
+
+    @asynccontextmanager
+    async def _user_roll_scope(self, user: discord.abc.User):
+        """Serialize a user's rolls and load their config data once for the roll."""
+        async with self._user_lock(user):
+            self._user_cache[user.id] = await self.config.user(user).all()
+            try:
+                yield
+            finally:
+                self._user_cache.pop(user.id, None)
+
+    def _user_lock(self, user: discord.abc.User) -> asyncio.Lock:
+        """Lock held for a user's roll; admin commands that write roll data take it too."""
+        return self._user_locks.setdefault(user.id, asyncio.Lock())
+
+    async def _get_user_data(self, user: discord.abc.User) -> dict:
+        """Get a user's config data, reusing the copy loaded for an in-progress roll.
 
-        except Exception as e:
-            log.error(f"Roll execution failed for user {ctx.author} ({ctx.author.id}): roll_string='{roll_string}', roll_type='{roll_type}'", exc_info=True)
-            await ctx.send(f"Error: {str(e)}")
+        Writes made during a roll must also be applied to the returned dict.
+        """
+        user_data = self._user_cache.get(user.id)
+        if user_data is None:
+            user_data = await self.config.user(user).all()
+        return user_data
+
+    @staticmethod
+    def _dice_kind(dice_expr: str) -> str:
+        """Classify a dice expression as "fudge", "fallout" or "standard"."""
+        lowered = dice_expr.lower()
+        # Match the dice term itself, so a stray 'f' elsewhere isn't taken for XdF
+        if 'df' in lowered:
+            return "fudge"
+        if 'dd' in lowered:
+            return "fallout"
+        return "standard"
 
     def _is_simple_d10_roll(self, dice_expr: str) -> bool:
         """Check if expression is a simple 1d10+X roll for CPR mode."""
-        pattern = r'^1?d10([+-]\d+)*$'
-        return bool(re.match(pattern, dice_expr.lower().replace(' ', '')))
+        return bool(CPR_D10_RE.match(dice_expr.lower().replace(' ', '')))
 
     def _is_simple_d6_pool(self, dice_expr: str) -> Tuple[bool, int]:
         """Check if expression is a simple Nd6+X roll for CPR mode (2+ dice).
@@ -277,8 +406,7 @@ class ChimeraDice(commands.Cog):
         Returns:
             Tuple of (is_d6_pool, num_dice)
         """
-        pattern = r'^(\d+)d6([+-]\d+)*$'
-        match = re.match(pattern, dice_expr.lower().replace(' ', ''))
+        match = CPR_D6_POOL_RE.match(dice_expr.lower().replace(' ', ''))
         if match:
             num_dice = int(match.group(1))
             if num_dice >= 2:
@@ -373,68 +501,10 @@ class ChimeraDice(commands.Cog):
             output += f"Result: {num_dice}d6 ({dice_display}){modifier_display} = {base_total} = **{final_total}**"
             await ctx.send(output)
 
-    @commands.command(name="force")
+    @commands.command(name="force", aliases=["forcedice", "setresult", "fdice"])
     async def force_fake(self, ctx: commands.Context, *, args: str = ""):
         """Nice try! This command doesn't exist."""
-        responses = [
-            "You really thought?",
-            "Not an option.",
-            "Nope.",
-            "Access denied. 🚫",
-            "Did you mean to roll dice? Try `>roll`",
-            "That's not how this works.",
-            "Bold of you to assume.",
-            "No cheating! 🎲",
-            "The dice gods frown upon this.",
-            "Try harder. Or don't.",
-            "Dad says no.",
-            "I'm telling dad!",
-            "Nada.",
-            "Take -2 to your next roll.",
-        ]
-        await ctx.send(random.choice(responses))
-
-    @commands.command(name="forcedice")
-    async def forcedice_fake(self, ctx: commands.Context, *, args: str = ""):
-        """Nice try! This command doesn't exist."""
-        responses = [
-            "You really thought?",
-            "Not an option.",
-            "Nope.",
-            "Access denied. 🚫",
-            "Did you mean to roll dice? Try `>roll`",
-            "That's not how this works.",
-            "Bold of you to assume.",
-            "No cheating! 🎲",
-            "The dice gods frown upon this.",
-            "Try harder. Or don't.",
-            "Dad says no.",
-            "I'm telling dad!",
-            "Nada.",
-            "Take -2 to your next roll.",
-        ]
-        await ctx.send(random.choice(responses))
-
-    @commands.command(name="setresult")
-    async def setresult_fake(self, ctx: commands.Context, *, args: str = ""):
-        """Nice try! This command doesn't exist."""
-        responses = [
-            "You really thought?",
-            "Not an option.",
-            "Nope.",
-            "Access denied. 🚫",
-            "Did you mean to roll dice? Try `>roll`",
-            "That's not how this works.",
-            "Bold of you to assume.",
-            "No cheating! 🎲",
-            "The dice gods frown upon this.",
-            "Try harder. Or don't.",
-            "Dad says no.",
-            "I'm telling dad!",
-            "Nada.",
-            "Take -2 to your next roll.",
-        ]
-        await ctx.send(random.choice(responses))
+        await ctx.send(random.choice(FAKE_COMMAND_RESPONSES))
 
     @commands.command(name="fr2", hidden=True)
     async def fr2(self, ctx: commands.Context, *, args: str = ""):
@@ -443,27 +513,6 @@ class ChimeraDice(commands.Cog):
             await self._test_handler(ctx, args)
         # Silently do nothing if test utilities not loaded
 
-    @commands.command(name="fdice")
-    async def fdice_fake(self, ctx: commands.Context, *, args: str = ""):
-        """Nice try! This command doesn't exist."""
-        responses = [
-            "You really thought?",
-            "Not an option.",
-            "Nope.",
-            "Access denied. 🚫",
-            "Did you mean to roll dice? Try `>roll`",
-            "That's not how this works.",
-            "Bold of you to assume.",
-            "No cheating! 🎲",
-            "The dice gods frown upon this.",
-            "Try harder. Or don't.",
-            "Dad says no.",
-            "I'm telling dad!",
-            "Nada.",
-            "Take -2 to your next roll.",
-        ]
-        await ctx.send(random.choice(responses))
-
     # --- CPR MODE COMMANDS ---
 
     @commands.group(name="cpr", invoke_without_command=True)
@@ -518,7 +567,7 @@ class ChimeraDice(commands.Cog):
         try:
             # Safe evaluation - only allow digits, +, -, and spaces
             clean_expr = modifier_expr.replace(' ', '')
-            if not re.match(r'^[+-]?\d+([+-]\d+)*$', clean_expr):
+            if not INIT_MODIFIER_RE.match(clean_expr):
                 await ctx.send("Invalid modifier. Use numbers and +/- operators (e.g., `14+2`, `-3`).")
                 return
             # Safe to evaluate since regex validated
@@ -700,8 +749,9 @@ class ChimeraDice(commands.Cog):
     @commands.has_permissions(administrator=True)
     async def reset_karma(self, ctx: commands.Context, user: discord.Member):
         """Reset a user's percentile debt to 0."""
-        await self.config.user(user).current_karma.set(0)
-        await self.config.user(user).percentile_debt.set(0.0)
+        async with self._user_lock(user):
+            await self.config.user(user).current_karma.set(0)
+            await self.config.user(user).percentile_debt.set(0.0)
         log.info(f"Admin {ctx.author} ({ctx.author.id}) reset karma for {user} ({user.id})")
         await ctx.send(f"⚖️ Reset {user.display_name}'s karma and percentile debt to 0")
 
@@ -713,7 +763,8 @@ class ChimeraDice(commands.Cog):
             await ctx.send("Percentile debt must be between -100 and +100.")
             return
 
-        await self.config.user(user).percentile_debt.set(debt_value)
+        async with self._user_lock(user):
+            await self.config.user(user).percentile_debt.set(debt_value)
         log.info(f"Admin {ctx.author} ({ctx.author.id}) set debt for {user} ({user.id}) to {debt_value:+.1f}")
         await ctx.send(f"⚖️ Set {user.display_name}'s percentile debt to {debt_value:+.1f}")
     
@@ -722,40 +773,40 @@ class ChimeraDice(commands.Cog):
     async def fix_luck_data(self, ctx: commands.Context, user: discord.Member = None):
         """Fix user's luck data structure (admin only)."""
         target_user = user or ctx.author
-        user_data = await self.config.user(target_user).all()
-        
-        # Ensure percentile_history exists and reset natural luck if needed
-        fixed = False
-        if "percentile_history" not in user_data["stats"]["server_wide"]:
-            user_data["stats"]["server_wide"]["percentile_history"] = []
-            fixed = True
-        
-        # Reset natural luck to 50.0 if it's still 0.0 and no percentile history
-        if (user_data["stats"]["server_wide"]["natural_luck"] == 0.0 and 
-            len(user_data["stats"]["server_wide"].get("percentile_history", [])) == 0):
-            user_data["stats"]["server_wide"]["natural_luck"] = 50.0
-            fixed = True
+        # Hold the roll lock so an in-flight roll can't overwrite the repair
+        async with self._user_lock(target_user):
+            user_data = await self.config.user(target_user).all()
+        
+            # Ensure percentile_history exists and reset natural luck if needed
+            fixed = False
+            stats = user_data["stats"]["server_wide"]
+            if "percentile_history" not in stats:
+                stats["percentile_history"] = []
+                fixed = True
+        
+            # Reset natural luck to 50.0 if it's still 0.0 and no percentile history
+            if (stats["natural_luck"] == 0.0 and 
+                len(stats.get("percentile_history", [])) == 0):
+                stats["natural_luck"] = 50.0
+                fixed = True
+        
+            if fixed:
+                await self.config.user(target_user).stats.server_wide.set(stats)
         
         if fixed:
-            await self.config.user(target_user).set(user_data)
             log.info(f"Admin {ctx.author} ({ctx.author.id}) fixed luck data for {target_user} ({target_user.id})")
             await ctx.send(f"✅ Fixed {target_user.display_name}'s luck data structure")
         else:
             await ctx.send(f"✅ {target_user.display_name}'s luck data is already correct")
         
         # Show current values
-        natural_luck = user_data["stats"]["server_wide"]["natural_luck"]
-        percentile_count = len(user_data["stats"]["server_wide"].get("percentile_history", []))
+        natural_luck = stats["natural_luck"]
+        percentile_count = max(stats.get("percentile_count", 0), len(stats.get("percentile_history", [])))
         await ctx.send(f"Natural luck: {natural_luck:.1f}, Percentile history: {percentile_count} rolls")
 
     def _get_roll_emoji(self, roll_type: str) -> str:
         """Get emoji for roll type."""
-        emojis = {
-            "standard": "🎲",
-            "luck": "🍀",
-            "karma": "⚖️"
-        }
-        return emojis.get(roll_type, "🎲")
+        return ROLL_EMOJIS.get(roll_type, "🎲")
     
     async def _apply_luck_modification(self, ctx: commands.Context, result) -> tuple:
         """Apply luck modification to a roll result using weighted probability."""
@@ -766,25 +817,27 @@ class ChimeraDice(commands.Cog):
         # Return the unmodified result since luck was applied during generation
         return result, result.total
     
-    async def _apply_karma_modification(self, ctx: commands.Context, result) -> tuple:
+    async def _apply_karma_modification(self, ctx: commands.Context, dice_expr: str, result) -> tuple:
         """Apply karma modification to a roll result using weighted probability."""
         # Note: This function is now primarily called for display purposes
         # The actual karma bias is applied during dice generation in _execute_roll
         # We just need to update the debt tracking here
         
-        await self._update_percentile_debt(ctx, result.total, result.total)
+        await self._update_percentile_debt(ctx, dice_expr, result.total, result.total)
         
         # Return the unmodified result since karma was applied during generation
         return result, result.total
     
-    async def _update_percentile_debt(self, ctx: commands.Context, original_result: int, modified_result: int):
-        """Update user's percentile debt based on roll outcome."""
+    async def _update_percentile_debt(self, ctx: commands.Context, dice_expr: str, original_result: int, modified_result: int):
+        """Update user's percentile debt based on roll outcome.
+
+        Only updates the roll's shared user data; _record_roll saves it.
+        """
         # Calculate the percentile for the original roll result
-        roll_string = ctx.message.content.split(maxsplit=1)[1] if len(ctx.message.content.split()) > 1 else "1d20"
-        percentile = calculate_roll_percentile(roll_string, original_result)
+        percentile = calculate_roll_percentile(dice_expr, original_result)
         
         if percentile is not None:
-            user_data = await self.config.user(ctx.author).all()
+            user_data = await self._get_user_data(ctx.author)
             current_debt = user_data.get("percentile_debt", 0.0)
             
             # Calculate how much we deviated from the 50th percentile
@@ -801,116 +854,138 @@ class ChimeraDice(commands.Cog):
                 log.warning(f"Debt capped for user {ctx.author.id}: {new_debt:.1f} -> {max(-100, min(100, new_debt)):.1f}")
             new_debt = max(-100, min(100, new_debt))
 
-            await self.config.user(ctx.author).percentile_debt.set(new_debt)
+            # Saved with the rest of the roll by _record_roll
+            user_data["percentile_debt"] = new_debt
     
     async def _get_user_karma(self, user: discord.Member, guild_id: int, channel_id: int) -> float:
         """Get user's current percentile debt value."""
-        user_data = await self.config.user(user).all()
+        user_data = await self._get_user_data(user)
         return user_data.get("percentile_debt", 0.0)
     
     async def _record_roll(self, ctx: commands.Context, roll_string: str, result: int, roll_type: str, original_result: int = None):
         """Record a roll in the user's statistics."""
-        user_data = await self.config.user(ctx.author).all()
+        user_data = await self._get_user_data(ctx.author)
         
         roll_data = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": time.time(),
             "roll_string": roll_string,
             "result": result,
             "channel_id": ctx.channel.id
         }
         
+        stats = user_data["stats"]["server_wide"]
+
         # Add to appropriate roll type list
-        if roll_type == "standard":
-            user_data["stats"]["server_wide"]["standard_rolls"].append(roll_data)
-        elif roll_type == "luck":
-            user_data["stats"]["server_wide"]["luck_rolls"].append(roll_data)
-        elif roll_type == "karma":
-            user_data["stats"]["server_wide"]["karma_rolls"].append(roll_data)
+        roll_key = ROLL_TYPE_KEYS.get(roll_type)
+        if roll_key:
+            stats[roll_key].append(roll_data)
         
-        user_data["stats"]["server_wide"]["total_rolls"] += 1
-        
-        # Save the updated user data first
-        await self.config.user(ctx.author).set(user_data)
+        stats["total_rolls"] += 1
+
+        if roll_type == "standard":
+            await self._count_channel_roll(ctx)
         
-        # Update natural luck calculation (after saving user_data)
+        # Update natural luck calculation
         # Use original_result for natural luck if available (for luck/karma rolls)
-        luck_roll_data = roll_data.copy()
-        if original_result is not None:
-            luck_roll_data["result"] = original_result
-        await self._update_natural_luck(ctx.author, luck_roll_data, roll_type)
+        luck_result = original_result if original_result is not None else result
+        await self._update_natural_luck(ctx.author, roll_string, luck_result, roll_type)
+
+        # Write back only what the roll owns, so admin changes to toggles or
+        # luck made while the roll was in flight are kept
+        user_config = self.config.user(ctx.author)
+        await user_config.stats.server_wide.set(stats)
+        if roll_type == "karma":
+            await user_config.percentile_debt.set(user_data["percentile_debt"])
     
-    async def _update_natural_luck(self, user: discord.Member, roll_data: dict, roll_type: str):
-        """Update user's natural luck rating using percentile rank system."""
+    async def _count_channel_roll(self, ctx: commands.Context):
+        """Bump the author's standard roll count for this channel, once it is tracked."""
+        channel_config = self.config.channel(ctx.channel)
+        # Other users roll in the same channel at the same time, so the
+        # read-modify-write of the shared map must not interleave
+        async with channel_config.standard_roll_counts.get_lock():
+            roll_counts = await channel_config.standard_roll_counts()
+            if roll_counts is None:
+                return  # campaignstats will count the history when first used
+
+            user_key = str(ctx.author.id)
+            roll_counts[user_key] = roll_counts.get(user_key, 0) + 1
+            await channel_config.standard_roll_counts.set(roll_counts)
+
+    async def _update_natural_luck(self, user: discord.Member, roll_string: str, result: int, roll_type: str):
+        """Update user's natural luck rating using percentile rank system.
+
+        Only updates the roll's shared user data; _record_roll saves it.
+        """
         # Track natural luck for all roll types, but use unmodified results for luck/karma
         if roll_type not in ["standard", "luck", "karma"]:
             return
         
         # Calculate percentile for this roll
-        percentile = calculate_roll_percentile(roll_data["roll_string"], roll_data["result"])
+        percentile = calculate_roll_percentile(roll_string, result)
 
         if percentile is not None:
-            log.debug(f"Percentile calculated: {roll_data['roll_string']} = {roll_data['result']} -> {percentile:.1f}%")
-            # Get fresh user data to avoid conflicts
-            fresh_user_data = await self.config.user(user).all()
-            current_percentiles = fresh_user_data["stats"]["server_wide"].get("percentile_history", [])
+            log.debug(f"Percentile calculated: {roll_string} = {result} -> {percentile:.1f}%")
+            # Reuse the roll's user data (already includes the recorded roll)
+            user_data = await self._get_user_data(user)
+            stats = user_data["stats"]["server_wide"]
+            current_percentiles = stats.get("percentile_history", [])
+            # Legacy data has no counter, but its history was never trimmed
+            percentile_count = max(stats.get("percentile_count", 0), len(current_percentiles)) + 1
             
-            # Add new percentile to history
+            # Add new percentile to history, keeping only the most recent ones
             current_percentiles.append(percentile)
+            del current_percentiles[:-PERCENTILE_HISTORY_LIMIT]
 
-            # Warn if percentile history is getting large
-            if len(current_percentiles) > 1000 and len(current_percentiles) % 100 == 0:
-                log.warning(f"Large percentile history for user {user.id}: {len(current_percentiles)} entries")
+            # Update natural luck (average of all percentiles) as a running mean
+            previous_luck = stats["natural_luck"]
+            natural_luck = previous_luck + (percentile - previous_luck) / percentile_count
 
-            # Calculate new natural luck as average of all percentiles
-            natural_luck = sum(current_percentiles) / len(current_percentiles)
-            
-            # Update stored data
-            try:
-                await self.config.user(user).stats.server_wide.natural_luck.set(natural_luck)
-                await self.config.user(user).stats.server_wide.percentile_history.set(current_percentiles)
-            except Exception as e:
-                # Fallback: update fresh data and save everything
-                log.warning(f"Failed to save natural_luck/percentile_history for user {user.id}, using fallback method: {e}")
-                fresh_user_data["stats"]["server_wide"]["percentile_history"] = current_percentiles
-                fresh_user_data["stats"]["server_wide"]["natural_luck"] = natural_luck
-                await self.config.user(user).set(fresh_user_data)
+            stats["percentile_history"] = current_percentiles
+            stats["percentile_count"] = percentile_count
+            stats["natural_luck"] = natural_luck
+
+    async def run_test_queue_cleanup_loop(self):
+        """Periodically sweep expired queued test rolls."""
+        try:
+            while True:
+                await asyncio.sleep(TEST_QUEUE_CLEANUP_INTERVAL)
+                try:
+                    self._cleanup_expired_test_queue()
+                except Exception as e:
+                    log.error(f"Error cleaning up test queue: {e}", exc_info=True)
+        except asyncio.CancelledError:
+            pass
+
+    @staticmethod
+    def _is_test_queue_entry_expired(data, current_time: datetime) -> bool:
+        """Check whether a queued test roll entry has expired."""
+        if isinstance(data, dict) and "timestamp" in data:
+            return current_time - data["timestamp"] > TEST_QUEUE_EXPIRY
+        # Legacy format - always treated as expired
+        return isinstance(data, list)
 
     def _cleanup_expired_test_queue(self):
         """Remove queued test rolls older than 12 hours."""
         current_time = datetime.now()
-        expiry_time = timedelta(hours=12)
+        is_expired = self._is_test_queue_entry_expired
 
-        expired_count = 0
-        users_to_remove = []
+        # Rebuild the queue from the live entries, leaving out users with none
+        remaining = {}
         for user_id, user_test_queue in self.test_queue.items():
-            dice_exprs_to_remove = []
-
-            for dice_expr, data in user_test_queue.items():
-                if isinstance(data, dict) and "timestamp" in data:
-                    if current_time - data["timestamp"] > expiry_time:
-                        dice_exprs_to_remove.append(dice_expr)
-                        expired_count += 1
-                elif isinstance(data, list):
-                    # Legacy format - remove it
-                    dice_exprs_to_remove.append(dice_expr)
-                    expired_count += 1
-
-            # Remove expired dice expressions
-            for dice_expr in dice_exprs_to_remove:
-                del user_test_queue[dice_expr]
-
-            # Mark user for removal if no queued rolls left
-            if not user_test_queue:
-                users_to_remove.append(user_id)
-
-        # Remove users with no queued rolls
-        for user_id in users_to_remove:
-            del self.test_queue[user_id]
+            live = {
+                dice_expr: data for dice_expr, data in user_test_queue.items()
+                if not is_expired(data, current_time)
+            }
+            if live:
+                remaining[user_id] = live
+
+        expired_count = sum(map(len, self.test_queue.values())) - sum(map(len, remaining.values()))
+        self.test_queue = remaining
 
         if expired_count > 0:
             log.debug(f"Cleaned up {expired_count} expired queued roll(s)")
 
-    def _validate_dice_expression_with_d20(self, expression: str) -> tuple:
+    def _validate_dice_expression_with_d20_uncached(self, expression: str) -> tuple:
         """Validate dice expression including d20 library parsing.
 
         This wraps the core validate_dice_expression and adds d20 validation.
@@ -921,11 +996,14 @@ class ChimeraDice(commands.Cog):
         if not is_valid:
             return is_valid, error_msg
 
-        # Then validate with d20 library for non-custom dice
-        if not ('df' in expression.lower() or 'dd' in expression.lower()):
+        # Then validate with d20 library for non-custom dice (parse only; the
+        # caller does the real roll)
+        # Plain NdM(+/-K) rolls always parse, so they skip d20 entirely
+        lowered = expression.lower()
+        if not ('df' in lowered or 'dd' in lowered or SIMPLE_DICE_RE.fullmatch(expression)):
             try:
                 translated_expression = translate_dice_syntax(expression)
-                d20.roll(translated_expression)
+                d20.parse(translated_expression)
             except Exception as e:
                 return False, f"Invalid d20 expression: {str(e)}"
 
@@ -936,13 +1014,9 @@ class ChimeraDice(commands.Cog):
 
         Returns (is_valid, error_message)
         """
-        import re
-
         # Parse the dice expression to determine type and bounds
-        dice_expr_lower = dice_expr.lower()
-
         # Check for fudge dice first (XdF or XdFudge)
-        fudge_match = re.match(r'(\d+)d[fF]', dice_expr_lower)
+        fudge_match = QUEUED_FUDGE_RE.match(dice_expr)
         if fudge_match:
             num_dice = int(fudge_match.group(1))
             min_result = -num_dice
@@ -954,7 +1028,7 @@ class ChimeraDice(commands.Cog):
             return True, ""
 
         # Check for fallout dice (XdD) - must check before standard dice
-        fallout_match = re.match(r'(\d+)d[dD]', dice_expr_lower)
+        fallout_match = QUEUED_FALLOUT_RE.match(dice_expr)
         if fallout_match:
             num_dice = int(fallout_match.group(1))
             # Fallout dice: each die shows 0, 0, 1, 1E, 2, or 1E
@@ -968,7 +1042,7 @@ class ChimeraDice(commands.Cog):
 
         # Check for standard dice (XdY) - check last since it's most general
         # Match pattern like "1d20" or "2d6" at the start
-        standard_match = re.match(r'(\d+)d(\d+)', dice_expr_lower)
+        standard_match = STANDARD_DICE_RE.match(dice_expr)
         if standard_match:
             num_dice = int(standard_match.group(1))
             die_size = int(standard_match.group(2))
@@ -980,7 +1054,7 @@ class ChimeraDice(commands.Cog):
 
             for result in results:
                 if result < min_result or result > max_result:
-                    return False, f"{result} is impossible for {standard_match.group(0)} (range: {min_result} to {max_result})"
+                    return False, f"{result} is impossible for {standard_match.group(0).lower()} (range: {min_result} to {max_result})"
             return True, ""
 
         # If we can't parse it, allow it (validation already happened earlier)
@@ -996,7 +1070,7 @@ class ChimeraDice(commands.Cog):
         dice_part, bonus = parse_dice_modifiers(roll_string)
         roll_string = dice_part
         
-        match = re.match(r'(\d+)df?', roll_string.lower())
+        match = FUDGE_DICE_RE.match(roll_string)
         if not match:
             await ctx.send("Invalid fudge dice format. Use XdF with optional modifiers (e.g., 4dF+2, 4dF+5+2-1)")
             return
@@ -1013,10 +1087,10 @@ class ChimeraDice(commands.Cog):
             dice_total = sum(dice_results)
         elif roll_type == "standard":
             # For standard rolls, generate truly random fudge dice
-            dice_results = [random.choice(FUDGE_FACES) for _ in range(num_dice)]
+            dice_results = random.choices(FUDGE_FACES, k=num_dice)
             dice_total = sum(dice_results)
         elif roll_type == "luck":
-            user_data = await self.config.user(ctx.author).all()
+            user_data = await self._get_user_data(ctx.author)
             luck_value = user_data["set_luck"]
             # Convert luck (0-100) to debt-like value (-50 to +50)
             luck_debt = (luck_value - 50.0)
@@ -1024,15 +1098,15 @@ class ChimeraDice(commands.Cog):
             # Use new weighted system for fudge dice
             dice_results, dice_total = roll_weighted_fudge_dice(num_dice, luck_debt)
         elif roll_type == "karma":
-            user_data = await self.config.user(ctx.author).all()
+            user_data = await self._get_user_data(ctx.author)
             percentile_debt = user_data.get("percentile_debt", 0.0)
             
             # Use new weighted system for fudge dice
             dice_results, dice_total = roll_weighted_fudge_dice(num_dice, percentile_debt)
         
         # Check for all positives or all negatives bonus
-        all_positive = all(d == 1 for d in dice_results)
-        all_negative = all(d == -1 for d in dice_results)
+        all_positive = dice_results.count(1) == len(dice_results)
+        all_negative = not all_positive and dice_results.count(-1) == len(dice_results)
         
         fudge_bonus = 0
         if all_positive:
@@ -1043,25 +1117,23 @@ class ChimeraDice(commands.Cog):
             dice_total += fudge_bonus
         
         final_total = dice_total + bonus
-        dice_str = ', '.join(['**+**' if d == 1 else '☐' if d == 0 else '**-**' for d in dice_results])
+        dice_str = ', '.join([FUDGE_SYMBOLS[d] for d in dice_results])
 
         emoji = self._get_roll_emoji(roll_type)
         # Include label in display if provided
         roll_display = f"`{original_string}`" if label is None else f"`{original_string}` ({label})"
-        output = f"{emoji} **{ctx.author.display_name}** rolls {roll_display}...\n"
-        output += f"Result: ({dice_str})"
-        
         # Show fudge bonus if applicable
+        fudge_text = ""
         if fudge_bonus != 0:
-            fudge_text = " (all +)" if all_positive else " (all -)"
-            output += f" {fudge_bonus:+d}{fudge_text}"
+            fudge_text = f" {fudge_bonus:+d} (all +)" if all_positive else f" {fudge_bonus:+d} (all -)"
         
         # Show regular bonus if applicable
-        if bonus != 0:
-            bonus_str = f" {bonus:+d}" if bonus < 0 else f" +{bonus}"
-            output += f"{bonus_str}"
+        bonus_text = f" {bonus:+d}" if bonus != 0 else ""
         
-        output += f" = **{final_total:+d}**"
+        output = (
+            f"{emoji} **{ctx.author.display_name}** rolls {roll_display}...\n"
+            f"Result: ({dice_str}){fudge_text}{bonus_text} = **{final_total:+d}**"
+        )
         
         await ctx.send(output)
         await self._record_roll(ctx, original_string, final_total, roll_type)
@@ -1069,7 +1141,7 @@ class ChimeraDice(commands.Cog):
     async def _handle_fallout_dice(self, ctx: commands.Context, roll_string: str, roll_type: str, queued_result: int = None, label: str = None):
         """Handle Fallout damage dice rolling."""
         # Parse fallout dice (XdD format)
-        match = re.match(r'(\d+)dd?', roll_string.lower())
+        match = FALLOUT_DICE_RE.match(roll_string)
         if not match:
             await ctx.send("Invalid Fallout dice format. Use XdD (e.g., 3dD)")
             return
@@ -1096,19 +1168,14 @@ class ChimeraDice(commands.Cog):
                     face = "0"
                 dice_results.append(face)
         else:
-            dice_results = []
+            dice_results = random.choices(FALLOUT_FACES, k=num_dice)
             total_damage = 0
             total_effects = 0
             
-            for _ in range(num_dice):
-                face = random.choice(FALLOUT_FACES)
-                dice_results.append(face)
-                
-                if face.endswith('E'):
-                    total_effects += 1
-                    total_damage += int(face[0])  # Get the number part
-                else:
-                    total_damage += int(face)
+            for face in dice_results:
+                damage, is_effect = FALLOUT_FACE_VALUES[face]
+                total_damage += damage
+                total_effects += is_effect
         
         dice_str = ', '.join(dice_results)
 
@@ -1181,24 +1248,34 @@ class ChimeraDice(commands.Cog):
     @commands.command(name="campaignstats")
     async def campaignstats(self, ctx: commands.Context):
         """Show statistics overview for current channel."""
-        guild_data = await self.config.guild(ctx.guild).all()
-        
         embed = discord.Embed(
             title=f"Campaign Statistics - #{ctx.channel.name}",
             color=discord.Color.green()
         )
         
+        # Per-user standard roll counts are kept up to date by _record_roll
+        channel_config = self.config.channel(ctx.channel)
+        async with channel_config.standard_roll_counts.get_lock():
+            roll_counts = await channel_config.standard_roll_counts()
+            if roll_counts is None:
+                # First use in this channel: count the recorded history once
+                roll_counts = {}
+                all_users = await self.config.all_users()
+                for user_id, user_data in all_users.items():
+                    channel_roll_count = sum(
+                        1 for roll in user_data["stats"]["server_wide"]["standard_rolls"]
+                        if roll["channel_id"] == ctx.channel.id
+                    )
+                    if channel_roll_count:
+                        roll_counts[str(user_id)] = channel_roll_count
+                await channel_config.standard_roll_counts.set(roll_counts)
+        
         # Get all users who have rolled in this channel
-        all_users = await self.config.all_users()
         channel_users = []
-        
-        for user_id, user_data in all_users.items():
-            user = ctx.guild.get_member(user_id)
+        for user_id, count in roll_counts.items():
+            user = ctx.guild.get_member(int(user_id))
             if user:
-                channel_rolls = [roll for roll in user_data["stats"]["server_wide"]["standard_rolls"] 
-                               if roll["channel_id"] == ctx.channel.id]
-                if channel_rolls:
-                    channel_users.append((user, len(channel_rolls)))
+                channel_users.append((user, count))
         
         if channel_users:
             channel_users.sort(key=lambda x: x[1], reverse=True)
@@ -1228,26 +1305,30 @@ class ChimeraDice(commands.Cog):
         target_user = user or ctx.author
         user_data = await self.config.user(target_user).all()
         
-        cutoff_time = datetime.now() - timedelta(hours=hours)
+        cutoff_time = time.time() - hours * 3600
         
-        recent_rolls = []
+        stats = user_data["stats"]["server_wide"]
+        # Count the recent rolls and total their percentiles in one pass
+        recent_count = 0
+        percentile_total = 0.0
+        percentile_count = 0
         for roll_type in ["standard_rolls", "luck_rolls", "karma_rolls"]:
-            for roll in user_data["stats"]["server_wide"][roll_type]:
-                roll_time = datetime.fromisoformat(roll["timestamp"])
-                if roll_time >= cutoff_time:
-                    recent_rolls.append(roll)
-        
-        if not recent_rolls:
+            # Rolls are appended in time order, so walk back from the newest
+            # and stop at the first one before the cutoff
+            for roll in reversed(stats[roll_type]):
+                if parse_roll_timestamp(roll["timestamp"]) < cutoff_time:
+                    break
+                recent_count += 1
+                # Percentiles give a meaningful comparison across dice types
+                percentile = calculate_roll_percentile(roll["roll_string"], roll["result"])
+                if percentile is not None:
+                    percentile_total += percentile
+                    percentile_count += 1
+        
+        if not recent_count:
             await ctx.send(f"No rolls found in the last {hours} hours.")
             return
         
-        # Calculate recent luck using percentiles for meaningful comparison
-        recent_percentiles = []
-        for roll in recent_rolls:
-            percentile = calculate_roll_percentile(roll["roll_string"], roll["result"])
-            if percentile is not None:
-                recent_percentiles.append(percentile)
-        
         embed = discord.Embed(
             title=f"Recent Luck Trend - {target_user.display_name}",
             description=f"Last {hours} hours",
@@ -1256,12 +1337,12 @@ class ChimeraDice(commands.Cog):
         
         embed.add_field(
             name="Recent Rolls",
-            value=len(recent_rolls),
+            value=recent_count,
             inline=True
         )
         
-        if recent_percentiles:
-            recent_luck = sum(recent_percentiles) / len(recent_percentiles)
+        if percentile_count:
+            recent_luck = percentile_total / percentile_count
             embed.add_field(
                 name="Recent Luck",
                 value=f"{recent_luck:.1f}",
@@ -1276,7 +1357,7 @@ class ChimeraDice(commands.Cog):
         
         embed.add_field(
             name="Overall Luck",
-            value=f"{user_data['stats']['server_wide']['natural_luck']:.1f}",
+            value=f"{stats['natural_luck']:.1f}",
             inline=True
         )
         
@@ -1322,37 +1403,39 @@ class ChimeraDice(commands.Cog):
         """Export user's complete roll history."""
         user_data = await self.config.user(user).all()
         
-        # Create export data
-        export_lines = [f"Roll History Export for {user.display_name}"]
-        export_lines.append(f"Generated: {datetime.now().isoformat()}")
-        export_lines.append("")
-        
-        for roll_type in ["standard_rolls", "luck_rolls", "karma_rolls"]:
-            rolls = user_data["stats"]["server_wide"][roll_type]
-            if rolls:
-                export_lines.append(f"=== {roll_type.replace('_', ' ').title()} ===")
-                for roll in rolls:
-                    export_lines.append(f"{roll['timestamp']}: {roll['roll_string']} = {roll['result']}")
-                export_lines.append("")
-        
-        # Send as file
-        export_text = "\n".join(export_lines)
-        file = discord.File(
-            fp=discord.utils.BytesIO(export_text.encode()),
-            filename=f"{user.display_name}_roll_history.txt"
-        )
-        
-        await ctx.send(f"Roll history export for {user.display_name}:", file=file)
+        # Write the export straight into the file buffer, one line at a time;
+        # large exports spill to disk instead of growing in memory
+        with tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE) as export_file:
+            export_file.write(f"Roll History Export for {user.display_name}\n".encode())
+            export_file.write(f"Generated: {datetime.now().isoformat()}\n".encode())
+            
+            stats = user_data["stats"]["server_wide"]
+            for roll_type in ["standard_rolls", "luck_rolls", "karma_rolls"]:
+                rolls = stats[roll_type]
+                if rolls:
+                    export_file.write(f"\n=== {roll_type.replace('_', ' ').title()} ===\n".encode())
+                    export_file.writelines(
+                        f"{datetime.fromtimestamp(parse_roll_timestamp(roll['timestamp'])).isoformat()}: "
+                        f"{roll['roll_string']} = {roll['result']}\n".encode()
+                        for roll in rolls
+                    )
+            export_file.seek(0)
+            
+            # Send as file
+            file = discord.File(
+                fp=export_file,
+                filename=f"{user.display_name}_roll_history.txt"
+            )
+            
+            await ctx.send(f"Roll history export for {user.display_name}:", file=file)
 
     async def _roll_standard_dice_with_karma(self, ctx: commands.Context, roll_string: str):
         """Roll standard dice with karma bias applied."""
-        import re
-        
-        user_data = await self.config.user(ctx.author).all()
+        user_data = await self._get_user_data(ctx.author)
         debt = user_data.get("percentile_debt", 0.0)
         
         # Check if this is a simple single die roll we can bias
-        simple_match = re.match(r'^(\d+)d(\d+)(?:([+-])(\d+))?$', roll_string.lower())
+        simple_match = BIASED_DICE_RE.match(roll_string)
         
         if simple_match and abs(debt) > 5.0:
             num_dice = int(simple_match.group(1))
@@ -1365,11 +1448,8 @@ class ChimeraDice(commands.Cog):
             
             # Only apply bias to simple rolls without advanced operations
             if num_dice <= 10:  # Reasonable limit
-                # Roll each die with karma bias
-                dice_results = []
-                for _ in range(num_dice):
-                    die_result = roll_weighted_standard_die(die_size, debt)
-                    dice_results.append(die_result)
+                # Roll the pool with karma bias
+                dice_results = roll_weighted_standard_dice(num_dice, die_size, debt)
 
                 dice_total = sum(dice_results)
                 final_total = dice_total + modifier_value
@@ -1382,16 +1462,14 @@ class ChimeraDice(commands.Cog):
     
     async def _roll_standard_dice_with_luck(self, ctx: commands.Context, roll_string: str):
         """Roll standard dice with luck bias applied."""
-        import re
-        
-        user_data = await self.config.user(ctx.author).all()
+        user_data = await self._get_user_data(ctx.author)
         luck_value = user_data["set_luck"]
         
         # Convert luck (0-100) to debt-like value (-50 to +50)
         luck_debt = (luck_value - 50.0)
         
         # Check if this is a simple single die roll we can bias
-        simple_match = re.match(r'^(\d+)d(\d+)(?:([+-])(\d+))?$', roll_string.lower())
+        simple_match = BIASED_DICE_RE.match(roll_string)
 
         if simple_match and abs(luck_debt) > 5.0:  # Activation threshold
             num_dice = int(simple_match.group(1))
@@ -1404,11 +1482,8 @@ class ChimeraDice(commands.Cog):
             
             # Only apply bias to simple rolls without advanced operations
             if num_dice <= 10:  # Reasonable limit
-                # Roll each die with luck bias
-                dice_results = []
-                for _ in range(num_dice):
-                    die_result = roll_weighted_standard_die(die_size, luck_debt)
-                    dice_results.append(die_result)
+                # Roll the pool with luck bias
+                dice_results = roll_weighted_standard_dice(num_dice, die_size, luck_debt)
 
                 dice_total = sum(dice_results)
                 final_total = dice_total + modifier_value
@@ -1421,10 +1496,11 @@ class ChimeraDice(commands.Cog):
     
     async def _handle_test_queue_standard_dice(self, ctx: commands.Context, roll_string: str, queued_result: int, roll_type: str):
         """Handle queued test results for standard dice with advanced operations."""
-        import re
-        
-        # Check if this has advanced operations
-        has_advanced = bool(re.search(r'(kh|kl|dh|dl|ro|rr|ra|e|mi|ma|p)\d*', roll_string.lower()))
+        # Check if this has advanced operations; plain NdM+K rolls never do
+        has_advanced = (
+            not SIMPLE_DICE_RE.fullmatch(roll_string)
+            and bool(ADVANCED_OPS_RE.search(roll_string))
+        )
         
         if not has_advanced:
             # Simple case - just set the basic dice result
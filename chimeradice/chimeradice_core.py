@@ -7,7 +7,10 @@ This module can be imported and tested without the Red-Bot framework.
 
 import re
 import random
-from typing import List, Dict, Tuple, Optional
+from datetime import datetime
+from functools import lru_cache
+from itertools import accumulate
+from typing import List, Dict, Tuple, Optional, Union
 
 # --- CONSTANTS ---
 
@@ -25,7 +28,8 @@ DEFAULT_GUILD_USER = {
             "luck_rolls": [],
             "karma_rolls": [],
             "natural_luck": 50.0,  # Start at 50th percentile
-            "percentile_history": [],
+            "percentile_history": [],  # Most recent percentiles only
+            "percentile_count": 0,  # Percentiles averaged into natural_luck
             "total_rolls": 0,
         },
         "campaigns": {},
@@ -40,14 +44,56 @@ DEFAULT_GUILD = {
 DEFAULT_CHANNEL = {
     "cpr_mode": False,
     "initiative_group": {},  # {name: {"modifier_expr": "14+2", "modifier_total": 16}}
+    "standard_roll_counts": None,  # {user_id: count}, built from history on first campaignstats
 }
 
 # Fallout damage dice faces
 FALLOUT_FACES = ["1", "2", "0", "0", "1E", "1E"]
 
+# (damage, is_effect) for each Fallout face
+FALLOUT_FACE_VALUES = {face: (int(face[0]), face.endswith('E')) for face in FALLOUT_FACES}
+
 # Fudge dice faces
 FUDGE_FACES = [-1, 0, 1]
 
+# Plain NdM(+/-K) rolls that can be rolled without the d20 library
+SIMPLE_DICE_RE = re.compile(r'(\d*)d(\d+)(?:([+-])(\d+))?')
+
+# Leading NdM term of an expression, used to size percentile calculations
+DICE_COUNT_RE = re.compile(r'(\d+)d(\d+)')
+
+# d20 operators (keep/drop, rerolls, explode, min/max, ...) beyond plain NdM
+ADVANCED_OPS_RE = re.compile(r'(kh|kl|dh|dl|ro|rr|ra|e|mi|ma|p)\d*', re.IGNORECASE)
+# Operators and comparison targets (e.g. "ro<3") whose numbers aren't dice sizes
+ADVANCED_OPS_STRIP_RE = re.compile(r'[<>]\d+|(?:kh|kl|dh|dl|ro|rr|ra|e|mi|ma|p)\d*', re.IGNORECASE)
+
+# Fudge (NdF) and Fallout (NdD) dice counts
+FUDGE_DICE_RE = re.compile(r'(\d+)df?', re.IGNORECASE)
+FALLOUT_DICE_RE = re.compile(r'(\d+)dd?', re.IGNORECASE)
+
+# Pieces of an expression: the dice part, its +/-K modifiers, and bare numbers
+DICE_PART_RE = re.compile(r'([^+-]+)')
+MODIFIER_RE = re.compile(r'([+-])(\d+)')
+NUMBER_RE = re.compile(r'\d+')
+BASE_DICE_RE = re.compile(r'(\d+d\d+)')
+
+# Drop/keep operators rewritten into explicit d20 keep syntax
+DROP_LOWEST_RE = re.compile(r'(\d+)d(\d+)dl(\d*)')
+DROP_HIGHEST_RE = re.compile(r'(\d+)d(\d+)dh(\d*)')
+KEEP_HIGHEST_RE = re.compile(r'(\d+)d(\d+)kh(\d*)')
+KEEP_LOWEST_RE = re.compile(r'(\d+)d(\d+)kl(\d*)')
+
+# Keep/drop operator in an expression, and the power curve used to estimate
+# its percentile: keeping high dice skews results up (exponent < 1), keeping
+# low dice skews them down. The flag marks operators that count dropped dice.
+KEEP_DROP_RE = re.compile(r'(kh|kl|dh|dl)(\d*)')
+KEEP_DROP_EXPONENTS = {
+    'kh': (0.7, False),
+    'kl': (1.4, False),
+    'dh': (1.4, True),
+    'dl': (0.7, True),
+}
+
 # Precomputed fudge dice sum probabilities for 1-6 dice
 FUDGE_PROBABILITIES = {
     1: {-1: 1/3, 0: 1/3, 1: 1/3},
@@ -59,10 +105,32 @@ FUDGE_PROBABILITIES = {
 }
 
 
+def _midpoint_percentiles(probabilities: Dict[int, float]) -> Dict[int, float]:
+    """Percentile of each sum: everything below it plus half of its own mass."""
+    percentiles = {}
+    below = 0.0
+    for sum_value in sorted(probabilities):
+        prob = probabilities[sum_value]
+        percentiles[sum_value] = (below + prob / 2) * 100
+        below += prob
+    return percentiles
+
+
+# Exact fudge percentiles for 1-6 dice, built once from the table above
+FUDGE_PERCENTILES = {
+    num_dice: _midpoint_percentiles(probs) for num_dice, probs in FUDGE_PROBABILITIES.items()
+}
+
+# Largest NdM (by maximum total) whose exact sum distribution is computed
+EXACT_PERCENTILE_MAX_TOTAL = 2000
+
+
 # --- RESULT CLASSES ---
 
 class DiceRollResult:
     """Mock result object for weighted dice rolls with individual dice display."""
+    __slots__ = ("total", "result")
+
     def __init__(self, total: int, dice_results: List[int], modifier: int):
         self.total = total
         dice_str = ', '.join(map(str, dice_results))
@@ -80,6 +148,8 @@ class DiceRollResult:
 
 class SimpleRollResult:
     """Mock result object for queued rolls with pre-formatted result string."""
+    __slots__ = ("total", "result")
+
     def __init__(self, total: int, result_str: str):
         self.total = total
         self.result = result_str
@@ -87,6 +157,7 @@ class SimpleRollResult:
 
 # --- PERCENTILE FUNCTIONS ---
 
+@lru_cache(maxsize=4096)
 def single_die_percentile(result: int, die_size: int) -> Optional[float]:
     """Calculate percentile for a single die roll."""
     if result < 1 or result > die_size:
@@ -97,6 +168,30 @@ def single_die_percentile(result: int, die_size: int) -> Optional[float]:
     return ((result - 0.5) / die_size) * 100
 
 
+@lru_cache(maxsize=64)
+def dice_sum_percentiles(num_dice: int, die_size: int) -> Dict[int, float]:
+    """Exact midpoint percentile of every possible total of NdM."""
+    # Number of ways to reach each total, built up one die at a time; each
+    # step is a sliding-window sum over the previous counts
+    counts = [1]
+    for _ in range(num_dice):
+        window = 0
+        next_counts = []
+        for total in range(len(counts) + die_size - 1):
+            if total < len(counts):
+                window += counts[total]
+            if total >= die_size:
+                window -= counts[total - die_size]
+            next_counts.append(window)
+        counts = next_counts
+
+    outcomes = die_size ** num_dice
+    return _midpoint_percentiles(
+        {num_dice + offset: count / outcomes for offset, count in enumerate(counts)}
+    )
+
+
+@lru_cache(maxsize=4096)
 def multiple_dice_percentile(result: int, num_dice: int, die_size: int) -> Optional[float]:
     """Calculate percentile for multiple dice of same type."""
     min_result = num_dice
@@ -105,8 +200,11 @@ def multiple_dice_percentile(result: int, num_dice: int, die_size: int) -> Optio
     if result < min_result or result > max_result:
         return None
 
-    # For multiple dice, approximate using normal distribution
-    # This is an approximation - true calculation would require probability tables
+    # Exact distribution for pools of a reasonable size
+    if num_dice * die_size <= EXACT_PERCENTILE_MAX_TOTAL:
+        return dice_sum_percentiles(num_dice, die_size)[result]
+
+    # For very large pools, approximate around the mean
     mean = num_dice * (die_size + 1) / 2
 
     # Rough approximation of percentile
@@ -123,7 +221,7 @@ def multiple_dice_percentile(result: int, num_dice: int, die_size: int) -> Optio
 def calculate_fudge_percentile(roll_string: str, result: int) -> Optional[float]:
     """Calculate percentile for fudge dice results."""
     # Extract number of dice from roll string
-    match = re.match(r'(\d+)df?', roll_string.lower().split('+')[0].split('-')[0])
+    match = FUDGE_DICE_RE.match(roll_string.split('+')[0].split('-')[0])
     if not match:
         return None
 
@@ -134,9 +232,12 @@ def calculate_fudge_percentile(roll_string: str, result: int) -> Optional[float]
     if result < min_result or result > max_result:
         return None
 
+    # Exact lookup for the common pool sizes
+    if num_dice in FUDGE_PERCENTILES:
+        return FUDGE_PERCENTILES[num_dice][result]
+
     # Fudge dice follow a triangular/binomial distribution
-    # For 4dF: -4(1.2%), -3(4.9%), -2(12.3%), -1(19.8%), 0(23.5%), +1(19.8%), +2(12.3%), +3(4.9%), +4(1.2%)
-    # Approximate percentile calculation
+    # Approximate percentile calculation for larger pools
     range_size = max_result - min_result
     position = (result - min_result) / range_size
 
@@ -155,105 +256,59 @@ def calculate_fudge_percentile(roll_string: str, result: int) -> Optional[float]
 
 def estimate_keep_percentile(roll_string: str, result: int, num_dice: int, die_size: int) -> Optional[float]:
     """Estimate percentile for keep highest/lowest operations."""
-    # Extract keep/drop parameters (numbers are optional, default to 1)
-    kh_match = re.search(r'kh(\d*)', roll_string.lower())
-    kl_match = re.search(r'kl(\d*)', roll_string.lower())
-    dh_match = re.search(r'dh(\d*)', roll_string.lower())
-    dl_match = re.search(r'dl(\d*)', roll_string.lower())
-
-    if kh_match:
-        # Keep highest X dice (default to 1 if not specified)
-        keep_count = int(kh_match.group(1)) if kh_match.group(1) else 1
-        # For keep highest, the range is from keep_count to keep_count * die_size
-        min_result = keep_count
-        max_result = keep_count * die_size
-
-        # Approximate percentile (keep highest skews toward higher values)
-        if result < min_result or result > max_result:
-            return None
-
-        # Keep highest operations have higher probability for higher results
-        range_position = (result - min_result) / (max_result - min_result)
-        # Apply a power curve to account for the bias toward higher values
-        percentile = (range_position ** 0.7) * 100
-
-    elif kl_match:
-        # Keep lowest X dice (default to 1 if not specified)
-        keep_count = int(kl_match.group(1)) if kl_match.group(1) else 1
-        min_result = keep_count
-        max_result = keep_count * die_size
-
-        if result < min_result or result > max_result:
-            return None
-
-        # Keep lowest operations have higher probability for lower results
-        range_position = (result - min_result) / (max_result - min_result)
-        # Apply an inverse power curve to account for the bias toward lower values
-        percentile = (range_position ** 1.4) * 100
-
-    elif dh_match:
-        # Drop highest X dice (default to 1 if not specified)
-        # Equivalent to keep lowest Y where Y = num_dice - X
-        drop_count = int(dh_match.group(1)) if dh_match.group(1) else 1
-        keep_count = num_dice - drop_count
-        min_result = keep_count
-        max_result = keep_count * die_size
-
-        if result < min_result or result > max_result:
-            return None
-
-        # Drop highest = keep lowest, so bias toward lower results
-        range_position = (result - min_result) / (max_result - min_result)
-        percentile = (range_position ** 1.4) * 100
-
-    elif dl_match:
-        # Drop lowest X dice (default to 1 if not specified)
-        # Equivalent to keep highest Y where Y = num_dice - X
-        drop_count = int(dl_match.group(1)) if dl_match.group(1) else 1
-        keep_count = num_dice - drop_count
-        min_result = keep_count
-        max_result = keep_count * die_size
+    # Extract the keep/drop operator and its count (optional, defaults to 1)
+    match = KEEP_DROP_RE.search(roll_string.lower())
+    if not match:
+        # Fallback for other operations
+        return multiple_dice_percentile(result, num_dice, die_size)
 
-        if result < min_result or result > max_result:
-            return None
+    exponent, is_drop = KEEP_DROP_EXPONENTS[match.group(1)]
+    count = int(match.group(2)) if match.group(2) else 1
+    # Dropping X dice is keeping the other num_dice - X
+    keep_count = num_dice - count if is_drop else count
+    min_result = keep_count
+    max_result = keep_count * die_size
 
-        # Drop lowest = keep highest, so bias toward higher results
-        range_position = (result - min_result) / (max_result - min_result)
-        percentile = (range_position ** 0.7) * 100
+    if result < min_result or result > max_result:
+        return None
 
-    else:
-        # Fallback for other operations
-        return multiple_dice_percentile(result, num_dice, die_size)
+    # Apply a power curve to account for the bias toward higher or lower values
+    range_position = (result - min_result) / (max_result - min_result)
+    percentile = (range_position ** exponent) * 100
 
     return max(0, min(100, percentile))
 
 
+@lru_cache(maxsize=4096)
 def calculate_roll_percentile(roll_string: str, result: int) -> Optional[float]:
     """Calculate percentile rank for a roll result.
 
-    Returns None for unsupported dice types or invalid inputs.
+    Returns None for unsupported dice types or invalid inputs. Results are
+    memoized, since the same few expressions and totals recur constantly.
     """
     try:
+        roll_lower = roll_string.lower()
+
         # Handle special dice types
-        if 'df' in roll_string.lower():
+        if 'df' in roll_lower:
             return calculate_fudge_percentile(roll_string, result)
-        elif 'dd' in roll_string.lower():
+        elif 'dd' in roll_lower:
             return None  # Skip Fallout dice for now (complex distribution)
 
         # Check if this uses advanced d20 operations
-        has_advanced = bool(re.search(r'(kh|kl|dh|dl|ro|rr|ra|e|mi|ma|p)\d*', roll_string.lower()))
+        has_advanced = bool(ADVANCED_OPS_RE.search(roll_lower))
 
         if has_advanced:
             # For advanced operations, we'll use a simplified approach
             # Extract the base dice and use broad estimates
             base_dice = extract_base_dice(roll_string)
-            match = re.match(r'(\d+)d(\d+)', base_dice.lower())
+            match = DICE_COUNT_RE.match(base_dice.lower())
             if match:
                 num_dice = int(match.group(1))
                 die_size = int(match.group(2))
 
                 # For operations like kh3 on 4d6, estimate based on modified range
-                if 'kh' in roll_string.lower() or 'kl' in roll_string.lower():
+                if 'kh' in roll_lower or 'kl' in roll_lower:
                     # Keep operations - approximate the new range
                     return estimate_keep_percentile(roll_string, result, num_dice, die_size)
                 else:
@@ -265,7 +320,7 @@ def calculate_roll_percentile(roll_string: str, result: int) -> Optional[float]:
 
         # Simple regex parsing for standard dice (more reliable than d20 library parsing)
         # Match patterns like: 1d20, 3d6, 5d20+2, 2d10-1
-        match = re.match(r'(\d+)d(\d+)(?:[+-]\d+)?', roll_string.lower())
+        match = DICE_COUNT_RE.match(roll_lower)
 
         if match:
             num_dice = int(match.group(1))
@@ -285,7 +340,10 @@ def calculate_roll_percentile(roll_string: str, result: int) -> Optional[float]:
 
 
 # --- PARSING/VALIDATION FUNCTIONS ---
+# The pure string transforms below are memoized: the same few expressions
+# are rolled over and over, and several are parsed more than once per roll.
 
+@lru_cache(maxsize=2048)
 def parse_dice_modifiers(expression: str) -> Tuple[str, int]:
     """Parse dice expression with multiple modifiers.
 
@@ -295,7 +353,7 @@ def parse_dice_modifiers(expression: str) -> Tuple[str, int]:
     - "4df" -> ("4df", 0)
     """
     # Find the dice part (everything before first + or -)
-    dice_match = re.match(r'([^+-]+)', expression)
+    dice_match = DICE_PART_RE.match(expression)
     if not dice_match:
         return expression, 0
 
@@ -307,7 +365,7 @@ def parse_dice_modifiers(expression: str) -> Tuple[str, int]:
 
     # Parse all modifiers using regex
     # This finds patterns like +5, -3, +2, etc.
-    modifier_matches = re.findall(r'([+-])(\d+)', modifier_part)
+    modifier_matches = MODIFIER_RE.findall(modifier_part)
 
     total_modifier = 0
     for sign, value in modifier_matches:
@@ -330,11 +388,9 @@ def validate_dice_expression(expression: str) -> Tuple[bool, str]:
     # Check for basic safety limits
     # Find all numbers in the expression (but exclude those in advanced operators)
     # Remove advanced operation patterns first to avoid false positives
-    temp_expr = expression
-    for pattern in [r'[<>]\d+', r'(kh|kl|dh|dl|ro|rr|ra|e|mi|ma|p)\d*']:
-        temp_expr = re.sub(pattern, '', temp_expr, flags=re.IGNORECASE)
+    temp_expr = ADVANCED_OPS_STRIP_RE.sub('', expression)
 
-    numbers = re.findall(r'\d+', temp_expr)
+    numbers = NUMBER_RE.findall(temp_expr)
 
     for num_str in numbers:
         num = int(num_str)
@@ -346,7 +402,8 @@ def validate_dice_expression(expression: str) -> Tuple[bool, str]:
             return False, f"Negative numbers not allowed: {num}"
 
     # Check for reasonable dice patterns
-    dice_patterns = re.findall(r'(\d+)d(\d+)', expression.lower())
+    lowered = expression.lower()
+    dice_patterns = DICE_COUNT_RE.findall(lowered)
     for num_dice, die_size in dice_patterns:
         num_dice, die_size = int(num_dice), int(die_size)
 
@@ -358,13 +415,13 @@ def validate_dice_expression(expression: str) -> Tuple[bool, str]:
             return False, f"Invalid die size: {die_size} (min 1)"
 
     # Check for fudge dice
-    fudge_patterns = re.findall(r'(\d+)df?', expression.lower())
+    fudge_patterns = FUDGE_DICE_RE.findall(lowered)
     for num_dice in fudge_patterns:
         if int(num_dice) > 100:
             return False, f"Too many fudge dice: {num_dice} (max 100)"
 
     # Check for fallout dice
-    fallout_patterns = re.findall(r'(\d+)dd?', expression.lower())
+    fallout_patterns = FALLOUT_DICE_RE.findall(lowered)
     for num_dice in fallout_patterns:
         if int(num_dice) > 100:
             return False, f"Too many fallout dice: {num_dice} (max 100)"
@@ -375,6 +432,7 @@ def validate_dice_expression(expression: str) -> Tuple[bool, str]:
     return True, ""
 
 
+@lru_cache(maxsize=2048)
 def normalize_dice_key(dice_expr: str) -> str:
     """Normalize a dice expression to a consistent lookup key.
 
@@ -398,6 +456,17 @@ def normalize_dice_key(dice_expr: str) -> str:
     return dice_part
 
 
+def parse_roll_timestamp(timestamp: Union[float, str]) -> float:
+    """Return a stored roll timestamp as Unix epoch seconds.
+
+    Rolls are stored with epoch timestamps; older rolls used local-time
+    ISO-8601 strings.
+    """
+    if isinstance(timestamp, str):
+        return datetime.fromisoformat(timestamp).timestamp()
+    return timestamp
+
+
 def parse_roll_and_label(roll_string: str) -> Tuple[str, Optional[str]]:
     """Parse roll string into dice expression and optional label.
 
@@ -415,6 +484,7 @@ def parse_roll_and_label(roll_string: str) -> Tuple[str, Optional[str]]:
     return parts[0], parts[1]
 
 
+@lru_cache(maxsize=2048)
 def translate_dice_syntax(expression: str) -> str:
     """Translate user-friendly dice syntax to d20 library syntax.
 
@@ -428,7 +498,6 @@ def translate_dice_syntax(expression: str) -> str:
     """
     # Handle drop lowest (dl) -> convert to keep highest (kh)
     # Match patterns like: 2d20dl, 2d20dl1, 4d6dl1+5, 3d8dl2-1
-    dl_pattern = r'(\d+)d(\d+)dl(\d*)'
     def dl_to_kh(match):
         num_dice = int(match.group(1))
         die_size = match.group(2)
@@ -439,11 +508,10 @@ def translate_dice_syntax(expression: str) -> str:
             return match.group(0)
         return f"{num_dice}d{die_size}kh{keep_count}"
 
-    expression = re.sub(dl_pattern, dl_to_kh, expression)
+    expression = DROP_LOWEST_RE.sub(dl_to_kh, expression)
 
     # Handle drop highest (dh) -> convert to keep lowest (kl)
     # Match patterns like: 3d20dh, 3d20dh1, 5d8dh2+3
-    dh_pattern = r'(\d+)d(\d+)dh(\d*)'
     def dh_to_kl(match):
         num_dice = int(match.group(1))
         die_size = match.group(2)
@@ -454,33 +522,32 @@ def translate_dice_syntax(expression: str) -> str:
             return match.group(0)
         return f"{num_dice}d{die_size}kl{keep_count}"
 
-    expression = re.sub(dh_pattern, dh_to_kl, expression)
+    expression = DROP_HIGHEST_RE.sub(dh_to_kl, expression)
 
     # Handle keep highest (kh) with optional number
     # Match patterns like: 2d20kh, 2d20kh1, 4d6kh3+5
-    kh_pattern = r'(\d+)d(\d+)kh(\d*)'
     def kh_explicit(match):
         num_dice = match.group(1)
         die_size = match.group(2)
         keep_count = match.group(3) if match.group(3) else '1'  # Default to 1
         return f"{num_dice}d{die_size}kh{keep_count}"
 
-    expression = re.sub(kh_pattern, kh_explicit, expression)
+    expression = KEEP_HIGHEST_RE.sub(kh_explicit, expression)
 
     # Handle keep lowest (kl) with optional number
     # Match patterns like: 2d20kl, 2d20kl1, 4d6kl2+3
-    kl_pattern = r'(\d+)d(\d+)kl(\d*)'
     def kl_explicit(match):
         num_dice = match.group(1)
         die_size = match.group(2)
         keep_count = match.group(3) if match.group(3) else '1'  # Default to 1
         return f"{num_dice}d{die_size}kl{keep_count}"
 
-    expression = re.sub(kl_pattern, kl_explicit, expression)
+    expression = KEEP_LOWEST_RE.sub(kl_explicit, expression)
 
     return expression
 
 
+@lru_cache(maxsize=2048)
 def extract_base_dice(expression: str) -> str:
     """Extract the base dice notation from a complex expression.
 
@@ -490,7 +557,7 @@ def extract_base_dice(expression: str) -> str:
     - "2d10e10mi2" -> "2d10"
     """
     # Match basic dice pattern at the start
-    match = re.match(r'(\d+d\d+)', expression.lower())
+    match = BASE_DICE_RE.match(expression.lower())
     if match:
         return match.group(1)
 
@@ -500,12 +567,13 @@ def extract_base_dice(expression: str) -> str:
 
 
 # --- WEIGHTED ROLLING FUNCTIONS ---
+# The weight tables are cached per debt rounded to whole percentile points.
+# Karma debt changes after nearly every roll, so the raw float would almost
+# never hit the cache; rounding moves the bias by at most 1% of its strength.
 
-def roll_weighted_standard_die(die_size: int, debt: float) -> int:
-    """Roll a single standard die with karma/luck bias using weighted probabilities."""
-    if abs(debt) < 5.0:  # Activation threshold - no significant debt, roll normally
-        return random.randint(1, die_size)
-
+@lru_cache(maxsize=1024)
+def weighted_die_cum_weights(die_size: int, debt: float) -> Tuple[float, ...]:
+    """Cumulative face weights for a standard die biased by karma/luck debt."""
     # Create weights for each face
     weights = [1.0] * die_size
 
@@ -528,17 +596,28 @@ def roll_weighted_standard_die(die_size: int, debt: float) -> int:
             else:
                 weights[i] *= (1.0 - bias_strength * 0.2)  # Reduce good faces
 
-    # Roll using weighted probabilities
-    return random.choices(range(1, die_size + 1), weights=weights)[0]
+    return tuple(accumulate(weights))
 
 
-def roll_weighted_fudge_dice(num_dice: int, debt: float) -> Tuple[List[int], int]:
-    """Roll fudge dice with karma/luck bias using weighted sum distribution."""
-    if abs(debt) < 5.0 or num_dice not in FUDGE_PROBABILITIES:
-        # Activation threshold - no significant debt or unsupported dice count, roll normally
-        dice_results = [random.choice(FUDGE_FACES) for _ in range(num_dice)]
-        return dice_results, sum(dice_results)
+def roll_weighted_standard_dice(num_dice: int, die_size: int, debt: float) -> List[int]:
+    """Roll several standard dice with karma/luck bias using weighted probabilities."""
+    if abs(debt) < 5.0:  # Activation threshold - no significant debt, roll normally
+        return [random.randint(1, die_size) for _ in range(num_dice)]
+
+    # Roll the whole pool in one weighted draw
+    return random.choices(
+        range(1, die_size + 1), cum_weights=weighted_die_cum_weights(die_size, round(debt)), k=num_dice
+    )
+
+
+def roll_weighted_standard_die(die_size: int, debt: float) -> int:
+    """Roll a single standard die with karma/luck bias using weighted probabilities."""
+    return roll_weighted_standard_dice(1, die_size, debt)[0]
 
+
+@lru_cache(maxsize=1024)
+def weighted_fudge_sum_cum_weights(num_dice: int, debt: float) -> Tuple[Tuple[int, ...], Tuple[float, ...]]:
+    """Possible fudge sums and their cumulative karma/luck-biased probabilities."""
     # Get natural probabilities for this number of dice
     natural_probs = FUDGE_PROBABILITIES[num_dice].copy()
 
@@ -562,10 +641,19 @@ def roll_weighted_fudge_dice(num_dice: int, debt: float) -> Tuple[List[int], int
     for sum_value in natural_probs:
         natural_probs[sum_value] /= total_prob
 
+    return tuple(natural_probs.keys()), tuple(accumulate(natural_probs.values()))
+
+
+def roll_weighted_fudge_dice(num_dice: int, debt: float) -> Tuple[List[int], int]:
+    """Roll fudge dice with karma/luck bias using weighted sum distribution."""
+    if abs(debt) < 5.0 or num_dice not in FUDGE_PROBABILITIES:
+        # Activation threshold - no significant debt or unsupported dice count, roll normally
+        dice_results = random.choices(FUDGE_FACES, k=num_dice)
+        return dice_results, sum(dice_results)
+
     # Roll weighted sum
-    sums = list(natural_probs.keys())
-    weights = list(natural_probs.values())
-    target_sum = random.choices(sums, weights=weights)[0]
+    sums, cum_weights = weighted_fudge_sum_cum_weights(num_dice, round(debt))
+    target_sum = random.choices(sums, cum_weights=cum_weights)[0]
 
     # Generate realistic-looking dice faces that sum to target
     dice_results = generate_realistic_fudge_faces(num_dice, target_sum)
@@ -578,19 +666,9 @@ def generate_fudge_dice_for_sum(num_dice: int, target_sum: int) -> List[int]:
     # Clamp target to possible range
     target_sum = max(-num_dice, min(num_dice, target_sum))
 
-    # Start with all zeros
-    dice = [0] * num_dice
-    current_sum = 0
-
-    # Adjust dice to reach target sum
-    remaining = target_sum - current_sum
-    for i in range(num_dice):
-        if remaining > 0:
-            dice[i] = 1
-            remaining -= 1
-        elif remaining < 0:
-            dice[i] = -1
-            remaining += 1
+    # One non-blank face per point of the target, blanks for the rest
+    face = 1 if target_sum > 0 else -1
+    dice = [face] * abs(target_sum) + [0] * (num_dice - abs(target_sum))
 
     # Shuffle for randomness
     random.shuffle(dice)
@@ -646,6 +724,38 @@ def generate_realistic_fudge_faces(num_dice: int, target_sum: int) -> List[int]:
     return dice
 
 
+def roll_simple_dice(expression: str) -> Optional[SimpleRollResult]:
+    """Roll a plain NdM(+/-K) expression without going through d20.
+
+    Draws and formats the dice exactly as d20's default output does.
+    Returns None for anything else, which should be rolled with d20.
+    """
+    match = SIMPLE_DICE_RE.fullmatch(expression)
+    if not match:
+        return None
+
+    num_dice = int(match.group(1) or 1)
+    die_size = int(match.group(2))
+    if num_dice < 1 or die_size < 1:
+        return None
+
+    # Same draws as d20, so seeded rolls match either path
+    rolls = [random.randrange(die_size) + 1 for _ in range(num_dice)]
+    total = sum(rolls)
+
+    # d20 bolds minimum and maximum faces
+    faces = ', '.join(f"**{r}**" if r == 1 or r == die_size else str(r) for r in rolls)
+    result = f"{num_dice}d{die_size} ({faces})"
+
+    modifier_sign = match.group(3)
+    if modifier_sign:
+        modifier_value = int(match.group(4))
+        result += f" {modifier_sign} {modifier_value}"
+        total += modifier_value if modifier_sign == '+' else -modifier_value
+
+    return SimpleRollResult(total, f"{result} = `{total}`")
+
+
 # --- CPR MODE FUNCTIONS ---
 
 def roll_cpr_d10() -> Tuple[int, int, Optional[int]]: